@@ -1,16 +1,24 @@
+import asyncio
 import logging
-import json
+import math
 import os
-import tempfile
+import re
+import time
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+from statistics import fmean
 from typing import Dict, Any, Optional
+import aiohttp
+import httpx
+import orjson
 import azure.functions as func
-from azure.storage.blob import BlobServiceClient
-from azure.ai.formrecognizer import DocumentAnalysisClient
+from azure.storage.blob import BlobSasPermissions, BlobType, generate_blob_sas
+from azure.storage.blob.aio import BlobServiceClient
+from azure.ai.formrecognizer.aio import DocumentAnalysisClient
 from azure.core.credentials import AzureKeyCredential
+from azure.core.pipeline.transport import AioHttpTransport
 import openai
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,9 +28,28 @@ logger = logging.getLogger(__name__)
 STORAGE_CONNECTION_STRING = os.environ.get('AZURE_STORAGE_CONNECTION_STRING')
 STORAGE_CONTAINER_NAME = os.environ.get('STORAGE_CONTAINER_NAME', 'paystubs')
 
+# Blob upload tuning: files up to the single-put size go in one PUT, larger
+# files are split into blocks that are staged in parallel and then committed
+AZURE_UPLOAD_CONCURRENCY = int(os.environ.get('AZURE_UPLOAD_CONCURRENCY', '8'))
+AZURE_UPLOAD_SINGLE_PUT_SIZE = 4 * 1024 * 1024  # 4 MiB
+AZURE_UPLOAD_BLOCK_SIZE = 1 * 1024 * 1024  # 1 MiB
+AZURE_STORAGE_CONNECTION_TIMEOUT = 20  # seconds
+
+# Read-only permission for per-blob SAS URLs handed back to the client
+_SAS_READ_PERMISSION = BlobSasPermissions(read=True)
+_SAS_TTL = timedelta(hours=1)
+
+# Shared HTTP connection pool settings for the Azure and OpenAI clients
+HTTP_CONNECTION_LIMIT = 100
+HTTP_KEEPALIVE_CONNECTIONS = 50
+HTTP_RETRY_TOTAL = 3
+HTTP_RETRY_BACKOFF_FACTOR = 0.5
+
 # Document Intelligence Configuration
 DOCUMENT_INTELLIGENCE_ENDPOINT = os.environ.get('AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT')
 DOCUMENT_INTELLIGENCE_KEY = os.environ.get('AZURE_DOCUMENT_INTELLIGENCE_KEY')
+# Concurrent analyze calls per worker, kept within the resource's request quota
+DOCUMENT_INTELLIGENCE_MAX_CONCURRENCY = int(os.environ.get('AZURE_DOCUMENT_INTELLIGENCE_MAX_CONCURRENCY', '15'))
 
 # OpenAI Configuration  
 OPENAI_ENDPOINT = os.environ.get('AZURE_OPENAI_ENDPOINT')
@@ -32,53 +59,180 @@ OPENAI_DEPLOYMENT_NAME = os.environ.get('AZURE_OPENAI_DEPLOYMENT_NAME', 'gpt-5-m
 # Default OCR service
 DEFAULT_OCR_SERVICE = os.environ.get('DEFAULT_OCR_SERVICE', 'azure_document_intelligence')
 
+# Pay stub key-value labels mapped to extracted field names
+FIELD_MAPPING = {
+    'employee name': 'employeeName',
+    'employer name': 'employerName',
+    'pay period': 'payPeriod',
+    'gross pay': 'grossPay',
+    'net pay': 'netPay',
+    'regular hours': 'regularHours',
+    'overtime hours': 'overtimeHours',
+    'hourly rate': 'hourlyRate',
+    'overtime rate': 'overtimeRate'
+}
+FIELD_KEYS_RE = re.compile('|'.join(re.escape(key) for key in FIELD_MAPPING))
+NUMERIC_FIELDS = frozenset({'grossPay', 'netPay', 'regularHours', 'overtimeHours', 'hourlyRate', 'overtimeRate'})
+REQUIRED_FIELDS = (
+    'employeeName', 'employerName', 'payPeriod', 'grossPay', 'netPay',
+    'regularHours', 'overtimeHours', 'hourlyRate', 'overtimeRate'
+)
+_NUM_STRIP = str.maketrans('', '', '$,')
+
+# GPT-5 OCR prompt engineering for pay stub extraction
+_GPT5_SYSTEM_PROMPT = """You are an expert OCR and data extraction specialist focused on pay stubs and wage documents.
+Extract the following fields from the pay stub image or document with high precision:
+
+REQUIRED FIELDS:
+- Employee Name: Full name of the worker
+- Employer Name: Company name
+- Pay Period: Start and end dates
+- Gross Pay: Total earnings before deductions
+- Net Pay: Take-home pay after deductions
+- Regular Hours: Standard hours worked
+- Overtime Hours: Hours beyond regular schedule
+- Hourly Rate: Regular hourly wage
+- Overtime Rate: Overtime hourly wage
+- Federal Tax: Federal tax withholding
+- State Tax: State tax withholding
+- Social Security: FICA deduction
+- Medicare: Medicare deduction
+
+CRITICAL REQUIREMENTS:
+1. Return data in valid JSON format
+2. Use 0.0 for missing numeric values
+3. Use "Not Found" for missing text values
+4. Provide confidence scores (0.0-1.0) for each field
+5. Handle various pay stub formats and layouts
+6. Extract both regular and overtime pay rates correctly
+
+Response format:
+{
+    "employeeName": {"value": "...", "confidence": 0.95},
+    "employerName": {"value": "...", "confidence": 0.98},
+    "payPeriod": {"value": "...", "confidence": 0.90},
+    "grossPay": {"value": 1234.56, "confidence": 0.97},
+    "netPay": {"value": 987.65, "confidence": 0.96},
+    ...
+}"""
+
+# Upload limits
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_REQUEST_SIZE = MAX_FILE_SIZE + 64 * 1024  # file plus multipart form overhead
+# Leading bytes of each accepted file type and the extensions allowed for it
+_MAGIC = {
+    b'%PDF-': ('.pdf',),
+    b'\x89PNG\r\n\x1a\n': ('.png',),
+    b'\xff\xd8\xff': ('.jpg', '.jpeg')
+}
+# WEBP files start RIFF....WEBP, so they are matched separately
+_WEBP_EXT = ('.webp',)
+
+# Pre-serialized bodies for common error responses
+_ERR_NO_FILE = orjson.dumps({"error": "No file provided"})
+_ERR_INVALID = orjson.dumps({"error": "Invalid file format or size"})
+
 app = func.FunctionApp()
 
 class OCRProcessor:
     """Handles OCR processing using multiple services"""
     
     def __init__(self):
-        self.blob_service_client = BlobServiceClient.from_connection_string(STORAGE_CONNECTION_STRING)
+        # Azure async clients bind to the event loop they are created on,
+        # so they are created lazily from within the running handler
+        self.transport = None
+        self.blob_service_client = None
         self.document_client = None
         self.openai_client = None
         
-        # Initialize Document Intelligence client
-        if DOCUMENT_INTELLIGENCE_ENDPOINT and DOCUMENT_INTELLIGENCE_KEY:
-            self.document_client = DocumentAnalysisClient(
-                endpoint=DOCUMENT_INTELLIGENCE_ENDPOINT,
-                credential=AzureKeyCredential(DOCUMENT_INTELLIGENCE_KEY)
-            )
+        # Concurrent requests on this worker share one analyze window
+        self.document_semaphore = asyncio.Semaphore(DOCUMENT_INTELLIGENCE_MAX_CONCURRENCY)
         
         # Initialize OpenAI client
         if OPENAI_ENDPOINT and OPENAI_API_KEY:
-            self.openai_client = AzureOpenAI(
+            self.openai_client = AsyncAzureOpenAI(
                 azure_endpoint=OPENAI_ENDPOINT,
                 api_key=OPENAI_API_KEY,
-                api_version="2024-08-01-preview"
+                api_version="2024-08-01-preview",
+                max_retries=HTTP_RETRY_TOTAL,
+                http_client=openai.DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=HTTP_CONNECTION_LIMIT,
+                        max_keepalive_connections=HTTP_KEEPALIVE_CONNECTIONS
+                    )
+                )
+            )
+
+    def _get_transport(self) -> AioHttpTransport:
+        """Get the aiohttp transport shared by all Azure clients, creating it on first use"""
+        if self.transport is None:
+            # The session is not owned by the transport, so closing one client
+            # never tears down the pool the other client is still using
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=HTTP_CONNECTION_LIMIT),
+                auto_decompress=False
+            )
+            self.transport = AioHttpTransport(
+                session=session,
+                session_owner=False,
+                connection_timeout=AZURE_STORAGE_CONNECTION_TIMEOUT
             )
+        return self.transport
+
+    def _get_blob_service_client(self) -> BlobServiceClient:
+        """Get the async Blob Storage client, creating it on first use"""
+        if self.blob_service_client is None:
+            self.blob_service_client = BlobServiceClient.from_connection_string(
+                STORAGE_CONNECTION_STRING,
+                transport=self._get_transport(),
+                retry_total=HTTP_RETRY_TOTAL,
+                max_single_put_size=AZURE_UPLOAD_SINGLE_PUT_SIZE,
+                max_block_size=AZURE_UPLOAD_BLOCK_SIZE
+            )
+        return self.blob_service_client
+
+    def _get_document_client(self) -> Optional[DocumentAnalysisClient]:
+        """Get the async Document Intelligence client, creating it on first use"""
+        if self.document_client is None and DOCUMENT_INTELLIGENCE_ENDPOINT and DOCUMENT_INTELLIGENCE_KEY:
+            self.document_client = DocumentAnalysisClient(
+                endpoint=DOCUMENT_INTELLIGENCE_ENDPOINT,
+                credential=AzureKeyCredential(DOCUMENT_INTELLIGENCE_KEY),
+                transport=self._get_transport(),
+                retry_total=HTTP_RETRY_TOTAL,
+                retry_backoff_factor=HTTP_RETRY_BACKOFF_FACTOR
+            )
+        return self.document_client
 
     async def process_document(self, file_data: bytes, filename: str, ocr_service: str = DEFAULT_OCR_SERVICE) -> Dict[str, Any]:
         """
         Process document using specified OCR service
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter_ns()
         submission_id = str(uuid.uuid4())
         
         try:
-            # Upload to blob storage first
-            blob_url = await self._upload_to_blob_storage(file_data, filename, submission_id)
-            
-            # Process with specified OCR service
+            # Select OCR service
             if ocr_service == 'azure_document_intelligence':
-                result = await self._process_with_document_intelligence(file_data)
+                ocr_task = self._process_with_document_intelligence(file_data)
                 service_used = 'Azure Document Intelligence'
             elif ocr_service == 'gpt_5_mini':
-                result = await self._process_with_gpt5(file_data)
+                ocr_task = self._process_with_gpt5(file_data)
                 service_used = 'GPT-5-mini'
             else:
                 raise ValueError(f"Unsupported OCR service: {ocr_service}")
             
-            processing_time = (datetime.now() - start_time).total_seconds() * 1000
+            # Blob upload and OCR hit independent services, so run them concurrently.
+            # Both are awaited to completion before any failure is re-raised.
+            blob_url, result = await asyncio.gather(
+                self._upload_to_blob_storage(file_data, filename, submission_id),
+                ocr_task,
+                return_exceptions=True
+            )
+            for outcome in (blob_url, result):
+                if isinstance(outcome, BaseException):
+                    raise outcome
+            
+            processing_time = (time.perf_counter_ns() - start_time) / 1_000_000
             
             return {
                 'submission_id': submission_id,
@@ -101,24 +255,29 @@ class OCRProcessor:
             blob_name = f"{submission_id}/{filename}"
             
             # Get container client
-            container_client = self.blob_service_client.get_container_client(STORAGE_CONTAINER_NAME)
+            blob_service_client = self._get_blob_service_client()
+            container_client = blob_service_client.get_container_client(STORAGE_CONTAINER_NAME)
             
-            # Upload blob
+            # Upload blob (files over one block are staged in parallel chunks)
             blob_client = container_client.get_blob_client(blob_name)
-            blob_client.upload_blob(file_data, overwrite=True)
+            await blob_client.upload_blob(
+                file_data,
+                overwrite=True,
+                blob_type=BlobType.BlockBlob,
+                max_concurrency=AZURE_UPLOAD_CONCURRENCY
+            )
             
             # Generate SAS URL with 1 hour expiry
-            from azure.storage.blob import generate_blob_sas, BlobSasPermissions
             sas_token = generate_blob_sas(
-                account_name=self.blob_service_client.account_name,
+                account_name=blob_service_client.account_name,
                 container_name=STORAGE_CONTAINER_NAME,
                 blob_name=blob_name,
-                account_key=self.blob_service_client.credential.account_key,
-                permission=BlobSasPermissions(read=True),
-                expiry=datetime.utcnow().replace(hour=23, minute=59, second=59)
+                account_key=blob_service_client.credential.account_key,
+                permission=_SAS_READ_PERMISSION,
+                expiry=datetime.utcnow() + _SAS_TTL
             )
             
-            blob_url = f"https://{self.blob_service_client.account_name}.blob.core.windows.net/{STORAGE_CONTAINER_NAME}/{blob_name}?{sas_token}"
+            blob_url = f"https://{blob_service_client.account_name}.blob.core.windows.net/{STORAGE_CONTAINER_NAME}/{blob_name}?{sas_token}"
             
             logger.info(f"File uploaded successfully: {blob_name}")
             return blob_url
@@ -129,34 +288,25 @@ class OCRProcessor:
 
     async def _process_with_document_intelligence(self, file_data: bytes) -> Dict[str, Any]:
         """Process document using Azure Document Intelligence"""
-        if not self.document_client:
+        document_client = self._get_document_client()
+        if not document_client:
             raise ValueError("Document Intelligence client not initialized")
         
         try:
-            # Create a temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                temp_file.write(file_data)
-                temp_file_path = temp_file.name
+            # Analyze document straight from memory; the SDK accepts raw bytes
+            async with self.document_semaphore:
+                poller = await document_client.begin_analyze_document(
+                    model_id='prebuilt-document',
+                    document=file_data
+                )
+                result = await poller.result()
+            
+            # Extract structured data
+            extracted_data = self._extract_structured_data_from_azure_result(result)
+            
+            logger.info("Document Intelligence processing completed successfully")
+            return extracted_data
             
-            try:
-                # Analyze document
-                with open(temp_file_path, 'rb') as document:
-                    poller = self.document_client.begin_analyze_document(
-                        model_id='prebuilt-document',
-                        document=document
-                    )
-                    result = poller.result()
-                
-                # Extract structured data
-                extracted_data = self._extract_structured_data_from_azure_result(result)
-                
-                logger.info("Document Intelligence processing completed successfully")
-                return extracted_data
-                
-            finally:
-                # Clean up temporary file
-                os.unlink(temp_file_path)
-                
         except Exception as e:
             logger.error(f"Error in Document Intelligence processing: {str(e)}")
             raise
@@ -167,45 +317,9 @@ class OCRProcessor:
             raise ValueError("OpenAI client not initialized")
         
         try:
-            # GPT-5 OCR prompt engineering for pay stub extraction
-            system_prompt = """You are an expert OCR and data extraction specialist focused on pay stubs and wage documents. 
-            Extract the following fields from the pay stub image or document with high precision:
-            
-            REQUIRED FIELDS:
-            - Employee Name: Full name of the worker
-            - Employer Name: Company name
-            - Pay Period: Start and end dates
-            - Gross Pay: Total earnings before deductions
-            - Net Pay: Take-home pay after deductions
-            - Regular Hours: Standard hours worked
-            - Overtime Hours: Hours beyond regular schedule
-            - Hourly Rate: Regular hourly wage
-            - Overtime Rate: Overtime hourly wage
-            - Federal Tax: Federal tax withholding
-            - State Tax: State tax withholding
-            - Social Security: FICA deduction
-            - Medicare: Medicare deduction
-            
-            CRITICAL REQUIREMENTS:
-            1. Return data in valid JSON format
-            2. Use 0.0 for missing numeric values
-            3. Use "Not Found" for missing text values
-            4. Provide confidence scores (0.0-1.0) for each field
-            5. Handle various pay stub formats and layouts
-            6. Extract both regular and overtime pay rates correctly
-            
-            Response format:
-            {
-                "employeeName": {"value": "...", "confidence": 0.95},
-                "employerName": {"value": "...", "confidence": 0.98},
-                "payPeriod": {"value": "...", "confidence": 0.90},
-                "grossPay": {"value": 1234.56, "confidence": 0.97},
-                "netPay": {"value": 987.65, "confidence": 0.96},
-                ...
-            }"""
-
             # For POC, we'll simulate GPT-5 processing
-            # In production, this would use the actual GPT-5 vision/OCR capabilities
+            # In production, this would send _GPT5_SYSTEM_PROMPT with the document to GPT-5 vision/OCR
+            # via `await self.openai_client.chat.completions.create(...)`
             mock_response = self._generate_mock_gpt5_response()
             
             logger.info("GPT-5-mini processing completed successfully")
@@ -228,38 +342,24 @@ class OCRProcessor:
                     confidence = kv.confidence if hasattr(kv, 'confidence') else 0.5
                     
                     # Map common pay stub fields
-                    field_mapping = {
-                        'employee name': 'employeeName',
-                        'employer name': 'employerName', 
-                        'pay period': 'payPeriod',
-                        'gross pay': 'grossPay',
-                        'net pay': 'netPay',
-                        'regular hours': 'regularHours',
-                        'overtime hours': 'overtimeHours',
-                        'hourly rate': 'hourlyRate',
-                        'overtime rate': 'overtimeRate'
-                    }
-                    
-                    for common_key, field_name in field_mapping.items():
-                        if common_key in key:
-                            # Try to parse numeric values
-                            if field_name in ['grossPay', 'netPay', 'regularHours', 'overtimeHours', 'hourlyRate', 'overtimeRate']:
-                                try:
-                                    numeric_value = float(value.replace('$', '').replace(',', ''))
-                                    extracted_data[field_name] = {"value": numeric_value, "confidence": confidence}
-                                except ValueError:
-                                    extracted_data[field_name] = {"value": 0.0, "confidence": 0.1}
-                            else:
-                                extracted_data[field_name] = {"value": value, "confidence": confidence}
-                            break
+                    match = FIELD_KEYS_RE.search(key)
+                    if match:
+                        field_name = FIELD_MAPPING[match.group(0)]
+                        # Try to parse numeric values
+                        if field_name in NUMERIC_FIELDS:
+                            try:
+                                numeric_value = float(value.translate(_NUM_STRIP))
+                                # float() also accepts "nan" and "inf", which are never valid amounts
+                                if not math.isfinite(numeric_value):
+                                    raise ValueError(f"Non-finite numeric value: {value}")
+                                extracted_data[field_name] = {"value": numeric_value, "confidence": confidence}
+                            except ValueError:
+                                extracted_data[field_name] = {"value": 0.0, "confidence": 0.1}
+                        else:
+                            extracted_data[field_name] = {"value": value, "confidence": confidence}
             
             # Ensure all required fields exist
-            required_fields = [
-                'employeeName', 'employerName', 'payPeriod', 'grossPay', 'netPay',
-                'regularHours', 'overtimeHours', 'hourlyRate', 'overtimeRate'
-            ]
-            
-            for field in required_fields:
+            for field in REQUIRED_FIELDS:
                 if field not in extracted_data:
                     extracted_data[field] = {"value": 0.0 if 'Rate' in field or 'Hours' in field or 'Pay' in field else "Not Found", "confidence": 0.0}
             
@@ -289,18 +389,14 @@ class OCRProcessor:
 
     def _calculate_confidence_scores(self, extracted_data: Dict[str, Any]) -> Dict[str, float]:
         """Calculate overall confidence scores"""
-        confidence_scores = {}
-        
-        for field_name, field_data in extracted_data.items():
-            if isinstance(field_data, dict) and 'confidence' in field_data:
-                confidence_scores[field_name] = field_data['confidence']
+        confidence_scores = {
+            field_name: field_data['confidence']
+            for field_name, field_data in extracted_data.items()
+            if isinstance(field_data, dict) and 'confidence' in field_data
+        }
         
         # Calculate overall confidence
-        if confidence_scores:
-            overall_confidence = sum(confidence_scores.values()) / len(confidence_scores)
-            confidence_scores['overall'] = overall_confidence
-        else:
-            confidence_scores['overall'] = 0.0
+        confidence_scores['overall'] = fmean(confidence_scores.values()) if confidence_scores else 0.0
         
         return confidence_scores
 
@@ -311,27 +407,38 @@ ocr_processor = OCRProcessor()
 async def process_ocr(req: func.HttpRequest) -> func.HttpResponse:
     """Main OCR processing endpoint"""
     try:
+        # Reject oversized requests before the multipart body is parsed
+        try:
+            content_length = int(req.headers.get('Content-Length', 0))
+        except ValueError:
+            content_length = 0
+        if content_length > MAX_REQUEST_SIZE:
+            return func.HttpResponse(
+                _ERR_INVALID,
+                status_code=400,
+                mimetype="application/json"
+            )
+        
         # Parse request
-        req_body = req.get_json()
-        ocr_service = req_body.get('ocr_service', DEFAULT_OCR_SERVICE)
+        ocr_service = _get_requested_ocr_service(req)
         
         # Get file data
         files = req.files.get('file')
         if not files:
             return func.HttpResponse(
-                json.dumps({"error": "No file provided"}),
+                _ERR_NO_FILE,
                 status_code=400,
                 mimetype="application/json"
             )
         
-        # Read file data
-        file_data = files.read()
+        # Read file data, aborting as soon as the size limit is exceeded
+        file_data = _read_upload(files)
         filename = files.filename
         
         # Validate file
-        if not _validate_file(file_data, filename):
+        if file_data is None or not _validate_file(file_data, filename):
             return func.HttpResponse(
-                json.dumps({"error": "Invalid file format or size"}),
+                _ERR_INVALID,
                 status_code=400,
                 mimetype="application/json"
             )
@@ -341,7 +448,7 @@ async def process_ocr(req: func.HttpRequest) -> func.HttpResponse:
         
         logger.info(f"Successfully processed document: {filename}")
         return func.HttpResponse(
-            json.dumps(result),
+            orjson.dumps(result),
             status_code=200,
             mimetype="application/json"
         )
@@ -349,56 +456,78 @@ async def process_ocr(req: func.HttpRequest) -> func.HttpResponse:
     except Exception as e:
         logger.error(f"Error in OCR processing: {str(e)}")
         return func.HttpResponse(
-            json.dumps({"error": f"Internal server error: {str(e)}"}),
+            orjson.dumps({"error": f"Internal server error: {str(e)}"}),
             status_code=500,
             mimetype="application/json"
         )
 
+def _get_requested_ocr_service(req: func.HttpRequest) -> str:
+    """Resolve the requested OCR service from form fields, query params or a JSON body"""
+    # Multipart uploads carry the service as a form field; only parse JSON when that is the body type
+    ocr_service = req.form.get('ocr_service') or req.params.get('ocr_service')
+    if ocr_service:
+        return ocr_service
+    
+    if req.headers.get('Content-Type', '').startswith('application/json'):
+        try:
+            req_body = req.get_json()
+        except ValueError:
+            req_body = None
+        if isinstance(req_body, dict):
+            return req_body.get('ocr_service', DEFAULT_OCR_SERVICE)
+    
+    return DEFAULT_OCR_SERVICE
+
+def _read_upload(files) -> Optional[bytes]:
+    """Read an uploaded file, returning None if it exceeds the size limit"""
+    # The multipart parser has already buffered the file; read at most one byte
+    # past the limit so oversized files are detected without a second copy
+    data = files.stream.read(MAX_FILE_SIZE + 1)
+    if len(data) > MAX_FILE_SIZE:
+        return None
+    return data
+
 def _validate_file(file_data: bytes, filename: str) -> bool:
     """Validate file format and size"""
     # Check file size (max 10MB)
-    if len(file_data) > 10 * 1024 * 1024:
+    if len(file_data) > MAX_FILE_SIZE:
         return False
     
-    # Check file extension
-    allowed_extensions = ['.pdf', '.jpg', '.jpeg', '.png', '.webp']
-    if not any(filename.lower().endswith(ext) for ext in allowed_extensions):
-        return False
+    # Check file content and require the extension to match the detected type,
+    # so renamed or corrupt files never reach blob storage or OCR
+    head = file_data[:12]
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        allowed_ext = _WEBP_EXT
+    else:
+        allowed_ext = next((ext for magic, ext in _MAGIC.items() if head.startswith(magic)), ())
     
-    return True
+    return filename.lower().endswith(allowed_ext)
+
+# Service availability depends only on env vars fixed for the process lifetime,
+# so the /ocr/services response is serialized once at import
+_SERVICES_RESPONSE_BYTES = orjson.dumps({
+    "services": [
+        {
+            "id": "azure_document_intelligence",
+            "name": "Azure Document Intelligence",
+            "description": "Azure's structured document processing service",
+            "available": DOCUMENT_INTELLIGENCE_ENDPOINT is not None
+        },
+        {
+            "id": "gpt_5_mini",
+            "name": "GPT-5-mini",
+            "description": "OpenAI's latest model with advanced OCR capabilities",
+            "available": OPENAI_ENDPOINT is not None
+        }
+    ],
+    "default": DEFAULT_OCR_SERVICE
+})
 
 @app.route(route="ocr/services", auth_level=func.AuthLevel.FUNCTION)
 async def get_ocr_services(req: func.HttpRequest) -> func.HttpResponse:
     """Get available OCR services"""
-    try:
-        services = {
-            "services": [
-                {
-                    "id": "azure_document_intelligence",
-                    "name": "Azure Document Intelligence",
-                    "description": "Azure's structured document processing service",
-                    "available": DOCUMENT_INTELLIGENCE_ENDPOINT is not None
-                },
-                {
-                    "id": "gpt_5_mini",
-                    "name": "GPT-5-mini",
-                    "description": "OpenAI's latest model with advanced OCR capabilities",
-                    "available": OPENAI_ENDPOINT is not None
-                }
-            ],
-            "default": DEFAULT_OCR_SERVICE
-        }
-        
-        return func.HttpResponse(
-            json.dumps(services),
-            status_code=200,
-            mimetype="application/json"
-        )
-        
-    except Exception as e:
-        logger.error(f"Error getting OCR services: {str(e)}")
-        return func.HttpResponse(
-            json.dumps({"error": str(e)}),
-            status_code=500,
-            mimetype="application/json"
-        )
\ No newline at end of file
+    return func.HttpResponse(
+        _SERVICES_RESPONSE_BYTES,
+        status_code=200,
+        mimetype="application/json"
+    )
\ No newline at end of file
@@ -1,11 +1,22 @@
 import logging
 import json
+import math
 import os
+import re
+from operator import attrgetter
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
-from decimal import Decimal, ROUND_HALF_UP
+from types import MappingProxyType, SimpleNamespace
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+from dataclasses import dataclass, field
+from enum import IntEnum
+import numpy as np
 import azure.functions as func
+from . import _rules_kernel as kernel
+
+try:
+    import orjson
+except ImportError:  # worker image without orjson
+    orjson = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -13,430 +24,504 @@ logger = logging.getLogger(__name__)
 
 app = func.FunctionApp()
 
+# Most pay stubs accepted by one /rules/analyze-batch request
+MAX_BATCH_SIZE = 500
+
+class Severity(IntEnum):
+    """Violation severity; the int value orders violations, most severe highest"""
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+
+# JSON names for each severity, indexed by Severity value - 1
+_SEVERITY_NAMES = ('low', 'medium', 'high')
+
 @dataclass
 class WorkData:
     """Structured work data from OCR processing"""
-    regular_hours: Decimal
-    overtime_hours: Decimal
-    double_time_hours: Decimal
-    hourly_rate: Decimal
-    overtime_rate: Decimal
-    double_time_rate: Decimal
-    gross_pay: Decimal
-    net_pay: Decimal
+    regular_hours: float
+    overtime_hours: float
+    double_time_hours: float
+    hourly_rate: float
+    overtime_rate: float
+    double_time_rate: float
+    gross_pay: float
+    net_pay: float
+    total_hours: float = field(init=False)  # regular + overtime + double time
     pay_period_start: Optional[datetime] = None
     pay_period_end: Optional[datetime] = None
     employee_name: str = ""
     employer_name: str = ""
+    
+    def __post_init__(self):
+        # Derived here so it can never disagree with the hour fields; rounded so
+        # float residue (8.299999999999999) never reaches the rules or descriptions
+        self.total_hours = round(self.regular_hours + self.overtime_hours + self.double_time_hours, 2)
 
-@dataclass
+@dataclass(slots=True)
 class Violation:
     """Represents a detected labor law violation"""
     violation_type: str
     description: str
-    severity: str  # 'low', 'medium', 'high'
+    severity: Severity
     confidence: float
     labor_code: str
-    actual_value: Optional[Decimal] = None
-    expected_value: Optional[Decimal] = None
+    actual_value: Optional[float] = None
+    expected_value: Optional[float] = None
     recommendation: Optional[str] = None
 
-class CaliforniaLaborRulesEngine:
-    """
-    California Labor Code Rules Engine
-    
-    Implements Tier 1 California labor law violations:
-    - Overtime calculations (daily and weekly)
-    - Meal break premiums (LC §512)
-    - Rest break premiums
-    - Pay stub requirements (LC §226)
+# Severity compares as a plain int, so sorting needs no Python-level key function
+_SORT_KEY = attrgetter('severity', 'confidence')
+
+def _json_default(obj: Any) -> Dict[str, Any]:
+    """Serialize Violation objects with the camelCase keys the API returns"""
+    if isinstance(obj, Violation):
+        return {
+            'violationType': obj.violation_type,
+            'description': obj.description,
+            'severity': _SEVERITY_NAMES[obj.severity - 1],
+            'confidence': obj.confidence,
+            'laborCode': obj.labor_code,
+            'actualValue': obj.actual_value,
+            'expectedValue': obj.expected_value,
+            'recommendation': obj.recommendation
+        }
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, preferring orjson when available"""
+    if orjson is not None:
+        # Dataclasses are passed through to _json_default for the camelCase mapping
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+    return json.dumps(obj, default=_json_default).encode('utf-8')
+
+# OCR fields parsed into WorkData: (OCR key, WorkData attribute, kind)
+_WORK_DATA_FIELDS = (
+    ('regularHours', 'regular_hours', 'num'),
+    ('overtimeHours', 'overtime_hours', 'num'),
+    ('doubleTimeHours', 'double_time_hours', 'num'),
+    ('hourlyRate', 'hourly_rate', 'num'),
+    ('overtimeRate', 'overtime_rate', 'num'),
+    ('doubleTimeRate', 'double_time_rate', 'num'),
+    ('grossPay', 'gross_pay', 'num'),
+    ('netPay', 'net_pay', 'num'),
+    ('employeeName', 'employee_name', 'str'),
+    ('employerName', 'employer_name', 'str')
+)
+_STRIP = str.maketrans('', '', '$,')
+
+# WorkData attributes passed to the rules kernel, in kernel.check_all's argument order
+_KERNEL_INPUTS = attrgetter(
+    'regular_hours',
+    'overtime_hours',
+    'double_time_hours',
+    'total_hours',
+    'hourly_rate',
+    'overtime_rate',
+    'double_time_rate',
+    'gross_pay'
+)
+
+# Pay period "start - end"; each half is MM/DD/YYYY, MM-DD-YYYY or YYYY-MM-DD
+_PAY_PERIOD_RE = re.compile(r'\s*(\S+)\s+-\s+(\S+)\s*$')
+_DATE_RE = re.compile(r'(\d{1,2})([/-])(\d{1,2})\2(\d{4})|(\d{4})-(\d{1,2})-(\d{1,2})')
+
+def _parse_date(value: str) -> Optional[datetime]:
+    """Parse a single pay period date without raising on unsupported formats"""
+    match = _DATE_RE.fullmatch(value)
+    if not match:
+        return None
+    month, _, day, year, iso_year, iso_month, iso_day = match.groups()
+    if iso_year:
+        year, month, day = iso_year, iso_month, iso_day
+    try:
+        return datetime(int(year), int(month), int(day))
+    except ValueError:  # out-of-range month or day
+        return None
+
+# Static parts of every violation the engine reports, built once at import.
+# Only desc_fmt (and rec for minimum wage) is formatted per violation.
+_VIOLATION_TEMPLATES = {
+    'daily_ot': SimpleNamespace(
+        type="Daily Overtime Violation",
+        desc_fmt="Employee worked {total} hours but was only paid for {actual} overtime hours. California law requires 1.5x regular rate for hours over 8 per day.",
+        severity=Severity.HIGH, confidence=0.95, code="CA Labor Code § 510",
+        rec="Pay overtime for all hours worked over 8 hours per day at 1.5x regular rate",
+        has_values=True
+    ),
+    'weekly_ot': SimpleNamespace(
+        type="Weekly Overtime Violation",
+        desc_fmt="Employee worked {total} hours in the week but was only paid for {actual} overtime hours. California law requires 1.5x regular rate for hours over 40 per week.",
+        severity=Severity.HIGH, confidence=0.90, code="CA Labor Code § 510",
+        rec="Pay overtime for all hours worked over 40 hours per week at 1.5x regular rate",
+        has_values=True
+    ),
+    'double_time': SimpleNamespace(
+        type="Double Time Violation",
+        desc_fmt="Employee worked {total} hours but was only paid for {actual} double time hours. California law requires 2x regular rate for hours over 12 per day.",
+        severity=Severity.HIGH, confidence=0.88, code="CA Labor Code § 510",
+        rec="Pay double time for all hours worked over 12 hours per day at 2x regular rate",
+        has_values=True
+    ),
+    'ot_rate': SimpleNamespace(
+        type="Overtime Rate Violation",
+        desc_fmt="Overtime rate of ${actual:.2f}/hr is below California requirement of ${expected:.2f}/hr (1.5x regular rate).",
+        severity=Severity.HIGH, confidence=0.95, code="CA Labor Code § 510",
+        rec="Pay proper overtime rate of 1.5x regular hourly rate",
+        has_values=True
+    ),
+    'meal_break': SimpleNamespace(
+        type="Meal Break Violation",
+        desc_fmt="Employee worked {total} hours but may not have received the required 30-minute meal break. California law requires meal breaks for shifts over 5 hours.",
+        severity=Severity.MEDIUM, confidence=0.85, code="CA Labor Code § 512",
+        rec="Provide 30-minute meal breaks for shifts over 5 hours or pay meal break premium of 1 hour of pay",
+        has_values=False
+    ),
+    'second_meal_break': SimpleNamespace(
+        type="Second Meal Break Violation",
+        desc_fmt="Employee worked {total} hours but may not have received the required second meal break. California law requires second meal break for shifts over 10 hours.",
+        severity=Severity.MEDIUM, confidence=0.90, code="CA Labor Code § 512",
+        rec="Provide second 30-minute meal break for shifts over 10 hours or pay additional meal break premium",
+        has_values=False
+    ),
+    'rest_break': SimpleNamespace(
+        type="Rest Break Violation",
+        desc_fmt="Employee worked {total} hours and should receive {breaks} rest breaks totaling {minutes} minutes. Rest breaks must be paid.",
+        severity=Severity.MEDIUM, confidence=0.80, code="CA Labor Code § 226",
+        rec="Provide paid 10-minute rest breaks for every 4 hours worked",
+        has_values=True
+    ),
+    'pay_calculation': SimpleNamespace(
+        type="Pay Calculation Discrepancy",
+        desc_fmt="Gross pay (${actual:.2f}) doesn't match calculated amount (${expected:.2f}). There may be an error in pay calculations.",
+        severity=Severity.MEDIUM, confidence=0.85, code="CA Labor Code § 226",
+        rec="Review and correct pay calculations to ensure accuracy",
+        has_values=True
+    ),
+    'min_wage': SimpleNamespace(
+        type="Minimum Wage Violation",
+        desc_fmt="Hourly rate of ${rate:.2f}/hr is below the applicable minimum wage of ${min_wage:.2f}/hr.",
+        severity=Severity.HIGH, confidence=0.98, code="CA Labor Code § 1182.12",
+        rec="Increase hourly rate to meet minimum wage of ${min_wage:.2f}/hr",
+        has_values=True
+    ),
+    'pay_stub_missing': SimpleNamespace(
+        type="Pay Stub Requirements Violation",
+        desc_fmt="Missing required information on pay stub: {fields}. California law requires specific itemized wage statements.",
+        severity=Severity.MEDIUM, confidence=0.95, code="CA Labor Code § 226",
+        rec="Include all required information on pay stubs",
+        has_values=False
+    ),
+    'pay_stub_readability': SimpleNamespace(
+        type="Pay Stub Readability Issue",
+        desc_fmt="Low confidence extraction for: {fields}. Pay stub may be unclear or missing required information.",
+        severity=Severity.LOW, confidence=0.75, code="CA Labor Code § 226",
+        rec="Ensure pay stub information is clearly legible and complete",
+        has_values=False
+    ),
+    'processing_error': SimpleNamespace(
+        type="Processing Error",
+        desc_fmt="Error during analysis: {error}",
+        severity=Severity.LOW, confidence=1.0, code="N/A",
+        rec=None,
+        has_values=False
+    )
+}
+
+# Required fields on California pay stubs: (OCR key, description)
+_REQUIRED_FIELDS = (
+    ('employeeName', 'Employee name'),
+    ('employerName', 'Employer name'),
+    ('payPeriod', 'Pay period dates'),
+    ('grossPay', 'Gross wages earned'),
+    ('netPay', 'Net wages earned'),
+    ('regularHours', 'Hours worked'),
+    ('hourlyRate', 'Hourly rate of pay')
+)
+# Extraction confidence below which a present field is reported as unreadable
+_LOW_CONFIDENCE_THRESHOLD = 0.70
+
+# Templates for the violation codes emitted by the rules kernel, indexed by code
+_KERNEL_TEMPLATES = tuple(_VIOLATION_TEMPLATES[name] for name in (
+    'daily_ot',           # kernel.DAILY_OVERTIME
+    'weekly_ot',          # kernel.WEEKLY_OVERTIME
+    'double_time',        # kernel.DOUBLE_TIME
+    'ot_rate',            # kernel.OVERTIME_RATE
+    'meal_break',         # kernel.MEAL_BREAK
+    'second_meal_break',  # kernel.SECOND_MEAL_BREAK
+    'rest_break',         # kernel.REST_BREAK
+    'pay_calculation'     # kernel.PAY_CALCULATION
+))
+
+# California Labor Code Rules Engine
+#
+# Implements Tier 1 California labor law violations:
+# - Overtime calculations (daily and weekly)
+# - Meal break premiums (LC §512)
+# - Rest break premiums
+# - Pay stub requirements (LC §226)
+#
+# The checks hold no state, so they are plain module functions reading
+# module-level constants and are safe to call from concurrent requests.
+
+# Minimum wage (will be updated based on location); built once at import and read-only
+MIN_WAGE_RATES: Mapping[str, float] = MappingProxyType({
+    'CA': 16.00,  # 2024 California minimum wage
+    'LOS_ANGELES': 16.78,
+    'SAN_FRANCISCO': 18.07,
+    'SAN_DIEGO': 16.30,
+    'SANTA_CLARA': 17.20,
+    'OAKLAND': 16.94
+})
+# City-specific rates keyed by normalized city name (upper case, underscores)
+CITY_MIN_WAGE_RATES: Mapping[str, float] = MappingProxyType({
+    city: rate for city, rate in MIN_WAGE_RATES.items() if city != 'CA'
+})
+
+def analyze_pay_stub(ocr_data: Dict[str, Any], location_info: Dict[str, str] = None) -> List[Violation]:
     """
+    Analyze pay stub data for California labor law violations
     
-    def __init__(self):
-        # California labor constants
-        self.daily_overtime_threshold = Decimal('8.0')
-        self.weekly_overtime_threshold = Decimal('40.0')
-        self.daily_double_time_threshold = Decimal('12.0')
-        self.overtime_multiplier = Decimal('1.5')
-        self.double_time_multiplier = Decimal('2.0')
+    Args:
+        ocr_data: Extracted data from OCR processing
+        location_info: Worker location (city, state) for minimum wage calculations
         
-        # Meal break requirements
-        self.meal_break_threshold = Decimal('5.0')  # 5 hours
-        self.second_meal_break_threshold = Decimal('10.0')  # 10 hours
-        self.meal_break_duration = Decimal('0.5')  # 30 minutes
-        self.meal_break_premium_rate = Decimal('1.0')  # 1 hour of pay
+    Returns:
+        List of detected violations
+    """
+    try:
+        # Parse OCR data into WorkData object
+        work_data = _parse_ocr_data(ocr_data)
+        violations = _check_all_rules(ocr_data, work_data, location_info)
         
-        # Rest break requirements
-        self.rest_break_interval = Decimal('4.0')  # Every 4 hours
-        self.rest_break_duration = Decimal('10')  # 10 minutes in minutes
+        logger.info(f"Analysis complete. Found {len(violations)} violations.")
         
-        # Minimum wage (will be updated based on location)
-        self.min_wage_rates = {
-            'CA': Decimal('16.00'),  # 2024 California minimum wage
-            'LOS_ANGELES': Decimal('16.78'),
-            'SAN_FRANCISCO': Decimal('18.07'),
-            'SAN_DIEGO': Decimal('16.30'),
-            'SANTA_CLARA': Decimal('17.20'),
-            'OAKLAND': Decimal('16.94')
-        }
+    except Exception as e:
+        logger.error(f"Error analyzing pay stub: {str(e)}")
+        violations = [_processing_error(e)]
     
-    def analyze_pay_stub(self, ocr_data: Dict[str, Any], location_info: Dict[str, str] = None) -> List[Violation]:
-        """
-        Analyze pay stub data for California labor law violations
-        
-        Args:
-            ocr_data: Extracted data from OCR processing
-            location_info: Worker location (city, state) for minimum wage calculations
-            
-        Returns:
-            List of detected violations
-        """
-        violations = []
+    return violations
+
+def analyze_pay_stubs(ocr_data_list: List[Dict[str, Any]], location_info: Dict[str, str] = None) -> List[List[Violation]]:
+    """
+    Analyze a batch of pay stubs for California labor law violations
+    
+    The numeric rule checks for the whole batch run in one parallel kernel call.
+    
+    Args:
+        ocr_data_list: Extracted data from OCR processing, one entry per pay stub
+        location_info: Worker location (city, state) applied to every pay stub
         
+    Returns:
+        List of detected violations for each pay stub, in input order
+    """
+    parsed = []
+    for ocr_data in ocr_data_list:
         try:
-            # Parse OCR data into WorkData object
-            work_data = self._parse_ocr_data(ocr_data)
-            
-            # Run all rule checks
-            violations.extend(self._check_overtime_violations(work_data))
-            violations.extend(self._check_meal_break_violations(work_data))
-            violations.extend(self._check_rest_break_violations(work_data))
-            violations.extend(self._check_minimum_wage_violations(work_data, location_info))
-            violations.extend(self._check_pay_stub_requirements(ocr_data))
-            violations.extend(self._check_pay_rate_calculations(work_data))
-            
-            # Sort violations by severity and confidence
-            violations.sort(key=lambda v: (self._severity_rank(v.severity), v.confidence), reverse=True)
-            
-            logger.info(f"Analysis complete. Found {len(violations)} violations.")
-            
+            parsed.append(_parse_ocr_data(ocr_data))
         except Exception as e:
             logger.error(f"Error analyzing pay stub: {str(e)}")
-            violations.append(Violation(
-                violation_type="Processing Error",
-                description=f"Error during analysis: {str(e)}",
-                severity="low",
-                confidence=1.0,
-                labor_code="N/A"
+            parsed.append(e)
+    
+    # Stack the kernel inputs into one (N, 8) array; stubs that failed to parse get a zero row
+    values = np.array(
+        [_KERNEL_INPUTS(work_data) if isinstance(work_data, WorkData) else (0.0,) * kernel.BATCH_COLUMNS
+         for work_data in parsed],
+        dtype=np.float64
+    ).reshape(-1, kernel.BATCH_COLUMNS)
+    codes, actual, expected, counts = kernel.check_batch(values)
+    
+    results = []
+    for i, (ocr_data, work_data) in enumerate(zip(ocr_data_list, parsed)):
+        if isinstance(work_data, Exception):
+            results.append([_processing_error(work_data)])
+            continue
+        try:
+            results.append(_check_all_rules(
+                ocr_data, work_data, location_info, (codes[i], actual[i], expected[i], counts[i])
             ))
-        
-        return violations
+        except Exception as e:
+            logger.error(f"Error analyzing pay stub: {str(e)}")
+            results.append([_processing_error(e)])
     
-    def _parse_ocr_data(self, ocr_data: Dict[str, Any]) -> WorkData:
-        """Parse OCR data into structured WorkData object"""
-        
-        def safe_decimal(value: Any, default: Decimal = Decimal('0')) -> Decimal:
-            """Safely convert value to Decimal"""
-            if isinstance(value, dict) and 'value' in value:
-                value = value['value']
-            
-            try:
-                if value is None or value == "":
-                    return default
-                return Decimal(str(value).replace('$', '').replace(',', ''))
-            except (ValueError, TypeError):
-                return default
-        
-        def safe_string(value: Any, default: str = "") -> str:
-            """Safely convert value to string"""
-            if isinstance(value, dict) and 'value' in value:
-                value = value['value']
-            return str(value) if value else default
-        
-        # Parse dates
-        pay_period_start = None
-        pay_period_end = None
-        pay_period_str = safe_string(ocr_data.get('payPeriod', ''))
-        
-        if ' - ' in pay_period_str:
-            try:
-                start_str, end_str = pay_period_str.split(' - ')
-                # Parse various date formats
-                for fmt in ['%m/%d/%Y', '%m-%d-%Y', '%Y-%m-%d']:
-                    try:
-                        pay_period_start = datetime.strptime(start_str.strip(), fmt)
-                        pay_period_end = datetime.strptime(end_str.strip(), fmt)
-                        break
-                    except ValueError:
-                        continue
-            except Exception:
-                pass
-        
-        return WorkData(
-            regular_hours=safe_decimal(ocr_data.get('regularHours')),
-            overtime_hours=safe_decimal(ocr_data.get('overtimeHours')),
-            double_time_hours=safe_decimal(ocr_data.get('doubleTimeHours')),
-            hourly_rate=safe_decimal(ocr_data.get('hourlyRate')),
-            overtime_rate=safe_decimal(ocr_data.get('overtimeRate')),
-            double_time_rate=safe_decimal(ocr_data.get('doubleTimeRate')),
-            gross_pay=safe_decimal(ocr_data.get('grossPay')),
-            net_pay=safe_decimal(ocr_data.get('netPay')),
-            pay_period_start=pay_period_start,
-            pay_period_end=pay_period_end,
-            employee_name=safe_string(ocr_data.get('employeeName')),
-            employer_name=safe_string(ocr_data.get('employerName'))
+    logger.info(f"Batch analysis complete. Analyzed {len(results)} pay stubs.")
+    
+    return results
+
+def _check_all_rules(ocr_data: Dict[str, Any], work_data: WorkData, location_info: Dict[str, str] = None,
+                     kernel_results: Optional[Tuple] = None) -> List[Violation]:
+    """Run all rule checks for one parsed pay stub, most severe violations first"""
+    violations = []
+    
+    # When OCR found no hours and no rate, only the pay stub field checks can produce violations
+    if not (work_data.total_hours == 0 and work_data.hourly_rate == 0):
+        violations.extend(_check_numeric_violations(work_data, kernel_results))
+        violations.extend(_check_minimum_wage_violations(work_data, location_info))
+    violations.extend(_check_pay_stub_requirements(ocr_data))
+    
+    # Sort violations by severity and confidence
+    violations.sort(key=_SORT_KEY, reverse=True)
+    
+    return violations
+
+def _processing_error(error: Exception) -> Violation:
+    """Report an analysis failure as a low severity violation"""
+    t = _VIOLATION_TEMPLATES['processing_error']
+    return Violation(t.type, t.desc_fmt.format(error=error), t.severity, t.confidence, t.code)
+
+def _parse_ocr_data(ocr_data: Dict[str, Any]) -> WorkData:
+    """Parse OCR data into structured WorkData object"""
+    fields = {}
+    for key, attr, kind in _WORK_DATA_FIELDS:
+        value = ocr_data.get(key)
+        if isinstance(value, dict):
+            value = value.get('value')
+        
+        if kind == 'num':
+            # Safely convert value to float, stripping currency formatting
+            if value is None or value == "":
+                fields[attr] = 0.0
+            else:
+                try:
+                    number = float(str(value).translate(_STRIP))
+                except (ValueError, TypeError):
+                    number = 0.0
+                # float() also accepts "nan" and "inf", which are never valid amounts
+                fields[attr] = number if math.isfinite(number) else 0.0
+        else:
+            fields[attr] = str(value) if value else ""
+    
+    # Parse dates
+    pay_period = ocr_data.get('payPeriod')
+    if isinstance(pay_period, dict):
+        pay_period = pay_period.get('value')
+    match = _PAY_PERIOD_RE.match(str(pay_period)) if pay_period else None
+    if match:
+        start_str, end_str = match.groups()
+        pay_period_start = _parse_date(start_str)
+        pay_period_end = _parse_date(end_str)
+        if pay_period_start and pay_period_end:
+            fields['pay_period_start'] = pay_period_start
+            fields['pay_period_end'] = pay_period_end
+    
+    return WorkData(**fields)
+
+def _check_numeric_violations(work_data: WorkData, kernel_results: Optional[Tuple] = None) -> List[Violation]:
+    """
+    Check overtime, meal break, rest break and pay calculation rules in the compiled kernel
+    
+    kernel_results is this pay stub's (codes, actual, expected, count) when
+    kernel.check_batch has already run the checks.
+    """
+    if kernel_results is None:
+        kernel_results = kernel.check_all(*_KERNEL_INPUTS(work_data))
+    codes, actual, expected, count = kernel_results
+    if not count:
+        return []
+    
+    total_hours = work_data.total_hours
+    required_breaks = int(total_hours // kernel.REST_BREAK_INTERVAL)
+    
+    violations = []
+    for i in range(count):
+        t = _KERNEL_TEMPLATES[codes[i]]
+        actual_value = round(float(actual[i]), 2)
+        expected_value = round(float(expected[i]), 2)
+        description = t.desc_fmt.format(
+            total=total_hours,
+            actual=actual_value,
+            expected=expected_value,
+            breaks=required_breaks,
+            minutes=int(required_breaks * kernel.REST_BREAK_DURATION)
         )
+        if t.has_values:
+            violations.append(Violation(t.type, description, t.severity, t.confidence, t.code, actual_value, expected_value, t.rec))
+        else:
+            violations.append(Violation(t.type, description, t.severity, t.confidence, t.code, recommendation=t.rec))
     
-    def _check_overtime_violations(self, work_data: WorkData) -> List[Violation]:
-        """Check for overtime violations"""
-        violations = []
-        
-        total_hours = work_data.regular_hours + work_data.overtime_hours + work_data.double_time_hours
-        
-        # Daily overtime check (if we have daily breakdown)
-        if total_hours > self.daily_overtime_threshold:
-            # Calculate expected overtime hours
-            expected_daily_ot = max(Decimal('0'), total_hours - self.daily_overtime_threshold)
-            
-            if work_data.overtime_hours < expected_daily_ot:
-                violation = Violation(
-                    violation_type="Daily Overtime Violation",
-                    description=f"Employee worked {total_hours} hours but was only paid for {work_data.overtime_hours} overtime hours. California law requires 1.5x regular rate for hours over 8 per day.",
-                    severity="high",
-                    confidence=0.95,
-                    labor_code="CA Labor Code § 510",
-                    actual_value=work_data.overtime_hours,
-                    expected_value=expected_daily_ot,
-                    recommendation="Pay overtime for all hours worked over 8 hours per day at 1.5x regular rate"
-                )
-                violations.append(violation)
-        
-        # Weekly overtime check
-        if total_hours > self.weekly_overtime_threshold:
-            expected_weekly_ot = max(Decimal('0'), total_hours - self.weekly_overtime_threshold)
-            
-            if work_data.overtime_hours < expected_weekly_ot:
-                violation = Violation(
-                    violation_type="Weekly Overtime Violation",
-                    description=f"Employee worked {total_hours} hours in the week but was only paid for {work_data.overtime_hours} overtime hours. California law requires 1.5x regular rate for hours over 40 per week.",
-                    severity="high",
-                    confidence=0.90,
-                    labor_code="CA Labor Code § 510",
-                    actual_value=work_data.overtime_hours,
-                    expected_value=expected_weekly_ot,
-                    recommendation="Pay overtime for all hours worked over 40 hours per week at 1.5x regular rate"
-                )
-                violations.append(violation)
-        
-        # Double time check
-        if total_hours > self.daily_double_time_threshold:
-            expected_double_time = max(Decimal('0'), total_hours - self.daily_double_time_threshold)
-            
-            if work_data.double_time_hours < expected_double_time:
-                violation = Violation(
-                    violation_type="Double Time Violation",
-                    description=f"Employee worked {total_hours} hours but was only paid for {work_data.double_time_hours} double time hours. California law requires 2x regular rate for hours over 12 per day.",
-                    severity="high",
-                    confidence=0.88,
-                    labor_code="CA Labor Code § 510",
-                    actual_value=work_data.double_time_hours,
-                    expected_value=expected_double_time,
-                    recommendation="Pay double time for all hours worked over 12 hours per day at 2x regular rate"
-                )
-                violations.append(violation)
-        
-        # Overtime rate check
-        expected_overtime_rate = (work_data.hourly_rate * self.overtime_multiplier).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-        if work_data.overtime_rate > 0 and work_data.overtime_rate < expected_overtime_rate:
-            violation = Violation(
-                violation_type="Overtime Rate Violation",
-                description=f"Overtime rate of ${work_data.overtime_rate}/hr is below California requirement of ${expected_overtime_rate}/hr (1.5x regular rate).",
-                severity="high",
-                confidence=0.95,
-                labor_code="CA Labor Code § 510",
-                actual_value=work_data.overtime_rate,
-                expected_value=expected_overtime_rate,
-                recommendation="Pay proper overtime rate of 1.5x regular hourly rate"
-            )
-            violations.append(violation)
-        
-        return violations
+    return violations
+
+def _check_minimum_wage_violations(work_data: WorkData, location_info: Dict[str, str] = None) -> List[Violation]:
+    """Check for minimum wage violations"""
+    violations = []
     
-    def _check_meal_break_violations(self, work_data: WorkData) -> List[Violation]:
-        """Check for meal break violations"""
-        violations = []
-        
-        total_hours = work_data.regular_hours + work_data.overtime_hours + work_data.double_time_hours
-        
-        # First meal break (5+ hours)
-        if total_hours >= self.meal_break_threshold:
-            # Check if meal break premium was paid
-            expected_premium = self.meal_break_premium_rate * work_data.hourly_rate
-            
-            # For POC, we assume no meal break premium was paid if overtime hours exceed threshold
-            if total_hours >= self.meal_break_threshold and total_hours < self.second_meal_break_threshold:
-                violation = Violation(
-                    violation_type="Meal Break Violation",
-                    description=f"Employee worked {total_hours} hours but may not have received the required 30-minute meal break. California law requires meal breaks for shifts over 5 hours.",
-                    severity="medium",
-                    confidence=0.85,
-                    labor_code="CA Labor Code § 512",
-                    recommendation="Provide 30-minute meal breaks for shifts over 5 hours or pay meal break premium of 1 hour of pay"
-                )
-                violations.append(violation)
-        
-        # Second meal break (10+ hours)
-        if total_hours >= self.second_meal_break_threshold:
-            violation = Violation(
-                violation_type="Second Meal Break Violation",
-                description=f"Employee worked {total_hours} hours but may not have received the required second meal break. California law requires second meal break for shifts over 10 hours.",
-                severity="medium",
-                confidence=0.90,
-                labor_code="CA Labor Code § 512",
-                recommendation="Provide second 30-minute meal break for shifts over 10 hours or pay additional meal break premium"
-            )
-            violations.append(violation)
-        
-        return violations
+    # Determine applicable minimum wage, defaulting to the state minimum
+    city = (location_info or {}).get('city') or ''
+    min_wage = CITY_MIN_WAGE_RATES.get(city.strip().upper().replace(' ', '_'), MIN_WAGE_RATES['CA'])
     
-    def _check_rest_break_violations(self, work_data: WorkData) -> List[Violation]:
-        """Check for rest break violations"""
-        violations = []
-        
-        total_hours = work_data.regular_hours + work_data.overtime_hours + work_data.double_time_hours
-        
-        # Calculate required rest breaks
-        if total_hours >= self.rest_break_interval:
-            required_breaks = int(total_hours / self.rest_break_interval)
-            
-            # For POC, we assume rest breaks weren't properly compensated
-            if required_breaks > 0:
-                total_break_time = required_breaks * self.rest_break_duration
-                break_pay = (total_break_time / Decimal('60')) * work_data.hourly_rate
-                
-                violation = Violation(
-                    violation_type="Rest Break Violation",
-                    description=f"Employee worked {total_hours} hours and should receive {required_breaks} rest breaks totaling {total_break_time} minutes. Rest breaks must be paid.",
-                    severity="medium",
-                    confidence=0.80,
-                    labor_code="CA Labor Code § 226",
-                    actual_value=Decimal('0'),
-                    expected_value=break_pay,
-                    recommendation="Provide paid 10-minute rest breaks for every 4 hours worked"
-                )
-                violations.append(violation)
-        
-        return violations
+    # Check if hourly rate meets minimum wage
+    if work_data.hourly_rate > 0 and work_data.hourly_rate < min_wage:
+        t = _VIOLATION_TEMPLATES['min_wage']
+        violations.append(Violation(
+            t.type,
+            t.desc_fmt.format(rate=work_data.hourly_rate, min_wage=min_wage),
+            t.severity,
+            t.confidence,
+            t.code,
+            work_data.hourly_rate,
+            min_wage,
+            t.rec.format(min_wage=min_wage)
+        ))
     
-    def _check_minimum_wage_violations(self, work_data: WorkData, location_info: Dict[str, str] = None) -> List[Violation]:
-        """Check for minimum wage violations"""
-        violations = []
-        
-        # Determine applicable minimum wage
-        min_wage = self.min_wage_rates['CA']  # Default to state minimum
-        
-        if location_info:
-            city = location_info.get('city', '').upper()
-            for location, rate in self.min_wage_rates.items():
-                if location != 'CA' and location.replace('_', ' ') in city.replace(' ', '_'):
-                    min_wage = rate
-                    break
-        
-        # Check if hourly rate meets minimum wage
-        if work_data.hourly_rate > 0 and work_data.hourly_rate < min_wage:
-            violation = Violation(
-                violation_type="Minimum Wage Violation",
-                description=f"Hourly rate of ${work_data.hourly_rate}/hr is below the applicable minimum wage of ${min_wage}/hr.",
-                severity="high",
-                confidence=0.98,
-                labor_code="CA Labor Code § 1182.12",
-                actual_value=work_data.hourly_rate,
-                expected_value=min_wage,
-                recommendation=f"Increase hourly rate to meet minimum wage of ${min_wage}/hr"
-            )
-            violations.append(violation)
-        
-        return violations
+    return violations
+
+def _check_pay_stub_requirements(ocr_data: Dict[str, Any]) -> List[Violation]:
+    """Check for pay stub requirements violations (LC §226)"""
+    violations = []
     
-    def _check_pay_stub_requirements(self, ocr_data: Dict[str, Any]) -> List[Violation]:
-        """Check for pay stub requirements violations (LC §226)"""
-        violations = []
-        
-        # Required fields on California pay stubs
-        required_fields = {
-            'employeeName': 'Employee name',
-            'employerName': 'Employer name',
-            'payPeriod': 'Pay period dates',
-            'grossPay': 'Gross wages earned',
-            'netPay': 'Net wages earned',
-            'regularHours': 'Hours worked',
-            'hourlyRate': 'Hourly rate of pay'
-        }
-        
-        missing_fields = []
-        low_confidence_fields = []
-        
-        for field, description in required_fields.items():
-            field_data = ocr_data.get(field)
-            
-            if not field_data:
-                missing_fields.append(description)
-            elif isinstance(field_data, dict) and field_data.get('confidence', 0) < 0.70:
-                low_confidence_fields.append(description)
-        
-        if missing_fields:
-            violation = Violation(
-                violation_type="Pay Stub Requirements Violation",
-                description=f"Missing required information on pay stub: {', '.join(missing_fields)}. California law requires specific itemized wage statements.",
-                severity="medium",
-                confidence=0.95,
-                labor_code="CA Labor Code § 226",
-                recommendation="Include all required information on pay stubs"
-            )
-            violations.append(violation)
-        
-        if low_confidence_fields:
-            violation = Violation(
-                violation_type="Pay Stub Readability Issue",
-                description=f"Low confidence extraction for: {', '.join(low_confidence_fields)}. Pay stub may be unclear or missing required information.",
-                severity="low",
-                confidence=0.75,
-                labor_code="CA Labor Code § 226",
-                recommendation="Ensure pay stub information is clearly legible and complete"
-            )
-            violations.append(violation)
-        
-        return violations
+    # Bit i of each mask is set when _REQUIRED_FIELDS[i] is missing or has low confidence
+    missing_mask = 0
+    low_confidence_mask = 0
     
-    def _check_pay_rate_calculations(self, work_data: WorkData) -> List[Violation]:
-        """Check for calculation inconsistencies in pay rates"""
-        violations = []
-        
-        # Check if gross pay matches calculated amount
-        if work_data.regular_hours > 0 and work_data.hourly_rate > 0:
-            calculated_regular_pay = work_data.regular_hours * work_data.hourly_rate
-            calculated_overtime_pay = work_data.overtime_hours * work_data.overtime_rate
-            calculated_double_pay = work_data.double_time_hours * work_data.double_time_rate
-            total_calculated = calculated_regular_pay + calculated_overtime_pay + calculated_double_pay
-            
-            # Allow for some tolerance due to rounding
-            tolerance = total_calculated * Decimal('0.05')  # 5% tolerance
-            
-            if abs(work_data.gross_pay - total_calculated) > tolerance:
-                violation = Violation(
-                    violation_type="Pay Calculation Discrepancy",
-                    description=f"Gross pay (${work_data.gross_pay}) doesn't match calculated amount (${total_calculated:.2f}). There may be an error in pay calculations.",
-                    severity="medium",
-                    confidence=0.85,
-                    labor_code="CA Labor Code § 226",
-                    actual_value=work_data.gross_pay,
-                    expected_value=total_calculated,
-                    recommendation="Review and correct pay calculations to ensure accuracy"
-                )
-                violations.append(violation)
+    for i, (field, _) in enumerate(_REQUIRED_FIELDS):
+        field_data = ocr_data.get(field)
         
-        return violations
+        if not field_data:
+            missing_mask |= 1 << i
+        elif isinstance(field_data, dict) and field_data.get('confidence', 0) < _LOW_CONFIDENCE_THRESHOLD:
+            low_confidence_mask |= 1 << i
+    
+    if missing_mask:
+        missing_fields = [description for i, (_, description) in enumerate(_REQUIRED_FIELDS) if missing_mask & (1 << i)]
+        t = _VIOLATION_TEMPLATES['pay_stub_missing']
+        violations.append(Violation(
+            t.type, t.desc_fmt.format(fields=', '.join(missing_fields)), t.severity, t.confidence, t.code, recommendation=t.rec
+        ))
     
-    def _severity_rank(self, severity: str) -> int:
-        """Helper method to sort violations by severity"""
-        severity_ranks = {'high': 3, 'medium': 2, 'low': 1}
-        return severity_ranks.get(severity, 0)
+    if low_confidence_mask:
+        low_confidence_fields = [description for i, (_, description) in enumerate(_REQUIRED_FIELDS) if low_confidence_mask & (1 << i)]
+        t = _VIOLATION_TEMPLATES['pay_stub_readability']
+        violations.append(Violation(
+            t.type, t.desc_fmt.format(fields=', '.join(low_confidence_fields)), t.severity, t.confidence, t.code, recommendation=t.rec
+        ))
+    
+    return violations
 
-# Initialize rules engine
-rules_engine = CaliforniaLaborRulesEngine()
+def _summarize(violations: List[Violation]) -> Dict[str, Any]:
+    """Summarize violation counts by severity and their average confidence"""
+    # Tally severities and confidence in a single pass
+    high = medium = low = 0
+    confidence_sum = 0.0
+    for violation in violations:
+        confidence_sum += violation.confidence
+        severity = violation.severity
+        if severity == Severity.HIGH:
+            high += 1
+        elif severity == Severity.MEDIUM:
+            medium += 1
+        else:
+            low += 1
+    
+    return {
+        'totalViolations': len(violations),
+        'highSeverity': high,
+        'mediumSeverity': medium,
+        'lowSeverity': low,
+        'averageConfidence': confidence_sum / len(violations) if violations else 0.0
+    }
 
 @app.route(route="rules/analyze", auth_level=func.AuthLevel.FUNCTION)
-async def analyze_labor_violations(req: func.HttpRequest) -> func.HttpResponse:
+def analyze_labor_violations(req: func.HttpRequest) -> func.HttpResponse:
     """Main endpoint for labor law violation analysis"""
     try:
         req_body = req.get_json()
@@ -447,37 +532,17 @@ async def analyze_labor_violations(req: func.HttpRequest) -> func.HttpResponse:
         
         if not ocr_data:
             return func.HttpResponse(
-                json.dumps({"error": "OCR data is required"}),
+                _json_dumps({"error": "OCR data is required"}),
                 status_code=400,
                 mimetype="application/json"
             )
         
         # Analyze for violations
-        violations = rules_engine.analyze_pay_stub(ocr_data, location_info)
-        
-        # Convert violations to serializable format
-        violations_json = []
-        for violation in violations:
-            violations_json.append({
-                'violationType': violation.violation_type,
-                'description': violation.description,
-                'severity': violation.severity,
-                'confidence': violation.confidence,
-                'laborCode': violation.labor_code,
-                'actualValue': float(violation.actual_value) if violation.actual_value else None,
-                'expectedValue': float(violation.expected_value) if violation.expected_value else None,
-                'recommendation': violation.recommendation
-            })
+        violations = analyze_pay_stub(ocr_data, location_info)
         
         result = {
-            'violations': violations_json,
-            'summary': {
-                'totalViolations': len(violations),
-                'highSeverity': len([v for v in violations if v.severity == 'high']),
-                'mediumSeverity': len([v for v in violations if v.severity == 'medium']),
-                'lowSeverity': len([v for v in violations if v.severity == 'low']),
-                'averageConfidence': sum(v.confidence for v in violations) / len(violations) if violations else 0.0
-            },
+            'violations': violations,
+            'summary': _summarize(violations),
             'analysisTimestamp': datetime.now().isoformat(),
             'rulesEngineVersion': '1.0.0'
         }
@@ -485,7 +550,7 @@ async def analyze_labor_violations(req: func.HttpRequest) -> func.HttpResponse:
         logger.info(f"Analysis completed successfully. Found {len(violations)} violations.")
         
         return func.HttpResponse(
-            json.dumps(result),
+            _json_dumps(result),
             status_code=200,
             mimetype="application/json"
         )
@@ -493,95 +558,141 @@ async def analyze_labor_violations(req: func.HttpRequest) -> func.HttpResponse:
     except Exception as e:
         logger.error(f"Error in labor violation analysis: {str(e)}")
         return func.HttpResponse(
-            json.dumps({"error": f"Internal server error: {str(e)}"}),
+            _json_dumps({"error": f"Internal server error: {str(e)}"}),
             status_code=500,
             mimetype="application/json"
         )
 
-@app.route(route="rules/info", auth_level=func.AuthLevel.FUNCTION)
-async def get_rules_info(req: func.HttpRequest) -> func.HttpResponse:
-    """Get information about supported rules and labor codes"""
+@app.route(route="rules/analyze-batch", auth_level=func.AuthLevel.FUNCTION)
+def analyze_labor_violations_batch(req: func.HttpRequest) -> func.HttpResponse:
+    """Batch endpoint for labor law violation analysis of many pay stubs in one call"""
     try:
-        rules_info = {
-            'rulesEngine': {
-                'name': 'California Labor Code Rules Engine',
-                'version': '1.0.0',
-                'description': 'Tier 1 California labor law violation detection'
-            },
-            'supportedViolations': [
-                {
-                    'type': 'Daily Overtime Violation',
-                    'description': 'Overtime pay for hours over 8 per day',
-                    'laborCode': 'CA Labor Code § 510',
-                    'severity': 'high'
-                },
-                {
-                    'type': 'Weekly Overtime Violation', 
-                    'description': 'Overtime pay for hours over 40 per week',
-                    'laborCode': 'CA Labor Code § 510',
-                    'severity': 'high'
-                },
-                {
-                    'type': 'Double Time Violation',
-                    'description': 'Double time pay for hours over 12 per day',
-                    'laborCode': 'CA Labor Code § 510',
-                    'severity': 'high'
-                },
-                {
-                    'type': 'Meal Break Violation',
-                    'description': 'Required meal breaks for shifts over 5 hours',
-                    'laborCode': 'CA Labor Code § 512',
-                    'severity': 'medium'
-                },
-                {
-                    'type': 'Rest Break Violation',
-                    'description': 'Paid rest breaks for every 4 hours worked',
-                    'laborCode': 'CA Labor Code § 226',
-                    'severity': 'medium'
-                },
-                {
-                    'type': 'Minimum Wage Violation',
-                    'description': 'Hourly rate below applicable minimum wage',
-                    'laborCode': 'CA Labor Code § 1182.12',
-                    'severity': 'high'
-                },
-                {
-                    'type': 'Pay Stub Requirements Violation',
-                    'description': 'Missing required information on pay stub',
-                    'laborCode': 'CA Labor Code § 226',
-                    'severity': 'medium'
-                }
+        req_body = req.get_json()
+        
+        # Extract OCR data for every pay stub and the shared location info
+        ocr_data_list = req_body.get('ocrDataList')
+        location_info = req_body.get('locationInfo', {})
+        
+        if not ocr_data_list or not isinstance(ocr_data_list, list) \
+                or not all(ocr_data and isinstance(ocr_data, dict) for ocr_data in ocr_data_list):
+            return func.HttpResponse(
+                _json_dumps({"error": "ocrDataList must be a non-empty list of OCR data objects"}),
+                status_code=400,
+                mimetype="application/json"
+            )
+        
+        if len(ocr_data_list) > MAX_BATCH_SIZE:
+            return func.HttpResponse(
+                _json_dumps({"error": f"ocrDataList must contain at most {MAX_BATCH_SIZE} pay stubs"}),
+                status_code=400,
+                mimetype="application/json"
+            )
+        
+        # Analyze all pay stubs for violations
+        results = analyze_pay_stubs(ocr_data_list, location_info)
+        
+        result = {
+            'results': [
+                {'violations': violations, 'summary': _summarize(violations)}
+                for violations in results
             ],
-            'minimumWageRates': {
-                'State': '16.00',
-                'Los Angeles': '16.78',
-                'San Francisco': '18.07',
-                'San Diego': '16.30',
-                'Santa Clara': '17.20',
-                'Oakland': '16.94'
-            },
-            'constants': {
-                'dailyOvertimeThreshold': '8.0 hours',
-                'weeklyOvertimeThreshold': '40.0 hours',
-                'dailyDoubleTimeThreshold': '12.0 hours',
-                'overtimeMultiplier': '1.5x',
-                'doubleTimeMultiplier': '2.0x',
-                'mealBreakThreshold': '5.0 hours',
-                'secondMealBreakThreshold': '10.0 hours',
-                'restBreakInterval': '4.0 hours'
-            }
+            'analysisTimestamp': datetime.now().isoformat(),
+            'rulesEngineVersion': '1.0.0'
         }
         
+        logger.info(f"Batch analysis completed successfully. Analyzed {len(results)} pay stubs.")
+        
         return func.HttpResponse(
-            json.dumps(rules_info),
+            _json_dumps(result),
             status_code=200,
             mimetype="application/json"
         )
         
     except Exception as e:
-        logger.error(f"Error getting rules info: {str(e)}")
+        logger.error(f"Error in batch labor violation analysis: {str(e)}")
         return func.HttpResponse(
-            json.dumps({"error": str(e)}),
+            _json_dumps({"error": f"Internal server error: {str(e)}"}),
             status_code=500,
             mimetype="application/json"
-        )
\ No newline at end of file
+        )
+
+# The supported rules never change at runtime, so the /rules/info response
+# is serialized once at import
+_RULES_INFO_BYTES = _json_dumps({
+    'rulesEngine': {
+        'name': 'California Labor Code Rules Engine',
+        'version': '1.0.0',
+        'description': 'Tier 1 California labor law violation detection'
+    },
+    'supportedViolations': [
+        {
+            'type': 'Daily Overtime Violation',
+            'description': 'Overtime pay for hours over 8 per day',
+            'laborCode': 'CA Labor Code § 510',
+            'severity': 'high'
+        },
+        {
+            'type': 'Weekly Overtime Violation',
+            'description': 'Overtime pay for hours over 40 per week',
+            'laborCode': 'CA Labor Code § 510',
+            'severity': 'high'
+        },
+        {
+            'type': 'Double Time Violation',
+            'description': 'Double time pay for hours over 12 per day',
+            'laborCode': 'CA Labor Code § 510',
+            'severity': 'high'
+        },
+        {
+            'type': 'Meal Break Violation',
+            'description': 'Required meal breaks for shifts over 5 hours',
+            'laborCode': 'CA Labor Code § 512',
+            'severity': 'medium'
+        },
+        {
+            'type': 'Rest Break Violation',
+            'description': 'Paid rest breaks for every 4 hours worked',
+            'laborCode': 'CA Labor Code § 226',
+            'severity': 'medium'
+        },
+        {
+            'type': 'Minimum Wage Violation',
+            'description': 'Hourly rate below applicable minimum wage',
+            'laborCode': 'CA Labor Code § 1182.12',
+            'severity': 'high'
+        },
+        {
+            'type': 'Pay Stub Requirements Violation',
+            'description': 'Missing required information on pay stub',
+            'laborCode': 'CA Labor Code § 226',
+            'severity': 'medium'
+        }
+    ],
+    'minimumWageRates': {
+        'State': '16.00',
+        'Los Angeles': '16.78',
+        'San Francisco': '18.07',
+        'San Diego': '16.30',
+        'Santa Clara': '17.20',
+        'Oakland': '16.94'
+    },
+    'constants': {
+        'dailyOvertimeThreshold': '8.0 hours',
+        'weeklyOvertimeThreshold': '40.0 hours',
+        'dailyDoubleTimeThreshold': '12.0 hours',
+        'overtimeMultiplier': '1.5x',
+        'doubleTimeMultiplier': '2.0x',
+        'mealBreakThreshold': '5.0 hours',
+        'secondMealBreakThreshold': '10.0 hours',
+        'restBreakInterval': '4.0 hours'
+    }
+})
+
+@app.route(route="rules/info", auth_level=func.AuthLevel.FUNCTION)
+def get_rules_info(req: func.HttpRequest) -> func.HttpResponse:
+    """Get information about supported rules and labor codes"""
+    return func.HttpResponse(
+        _RULES_INFO_BYTES,
+        status_code=200,
+        mimetype="application/json"
+    )
\ No newline at end of file
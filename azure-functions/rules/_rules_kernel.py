@@ -0,0 +1,180 @@
+import math
+import numba
+import numpy as np
+from numba import njit, prange
+
+# Sync handlers run on the worker thread pool, so check_batch can be launched from
+# several threads at once. The workqueue layer aborts the process on concurrent
+# launches; require tbb (or omp), which support them.
+numba.config.THREADING_LAYER = 'threadsafe'
+
+# Violation codes emitted by check_all, in the order the checks run
+DAILY_OVERTIME = 0
+WEEKLY_OVERTIME = 1
+DOUBLE_TIME = 2
+OVERTIME_RATE = 3
+MEAL_BREAK = 4
+SECOND_MEAL_BREAK = 5
+REST_BREAK = 6
+PAY_CALCULATION = 7
+MAX_VIOLATIONS = 8
+
+# Columns of the (N, BATCH_COLUMNS) array passed to check_batch, in check_all's argument order
+BATCH_COLUMNS = 8
+
+# California labor constants
+DAILY_OVERTIME_THRESHOLD = 8.0
+WEEKLY_OVERTIME_THRESHOLD = 40.0
+DAILY_DOUBLE_TIME_THRESHOLD = 12.0
+OVERTIME_MULTIPLIER = 1.5
+
+# Meal break requirements
+MEAL_BREAK_THRESHOLD = 5.0  # 5 hours
+SECOND_MEAL_BREAK_THRESHOLD = 10.0  # 10 hours
+
+# Rest break requirements
+REST_BREAK_INTERVAL = 4.0  # Every 4 hours
+REST_BREAK_DURATION = 10.0  # 10 minutes
+
+# Allowed gross pay deviation from the calculated amount
+PAY_CALCULATION_TOLERANCE = 0.05  # 5%
+
+# Explicit signatures make Numba compile eagerly at import, during worker host
+# init, instead of on the first request. cache=True lets later cold starts on the
+# same instance load the compiled code instead of recompiling. The cache is written
+# at runtime, not shipped in the deployment package: its index is keyed to this
+# file's mtime and the host CPU, and run-from-package deployments mount wwwroot
+# read-only (Numba then falls back to a per-user cache directory).
+_CHECK_ALL_SIGNATURE = (
+    'Tuple((int64[:], float64[:], float64[:], int64))'
+    '(float64, float64, float64, float64, float64, float64, float64, float64)'
+)
+_CHECK_BATCH_SIGNATURE = (
+    'Tuple((int64[:, :], float64[:, :], float64[:, :], int64[:]))'
+    '(float64[:, :])'
+)
+
+
+@njit('float64(float64)', cache=True)
+def round_cents(value):
+    """Round a dollar amount (or hours) to hundredths, half up"""
+    # NaN and infinity pass through unchanged; math.floor would turn them into INT64_MIN
+    if not math.isfinite(value):
+        return value
+    # The epsilon keeps values like 25.005 (stored as 25.00499...) rounding up
+    return math.floor(value * 100.0 + 0.5 + 1e-9) / 100.0
+
+
+@njit(_CHECK_ALL_SIGNATURE, cache=True)
+def check_all(regular_hours, overtime_hours, double_time_hours, total_hours,
+              hourly_rate, overtime_rate, double_time_rate, gross_pay):
+    """
+    Run every numeric rule check for one pay stub
+
+    total_hours is regular + overtime + double time hours, computed once by the caller.
+
+    Returns:
+        (codes, actual, expected, n): the first n entries of the arrays hold the
+        violation code and its actual/expected values (0.0 where not applicable)
+    """
+    codes = np.empty(MAX_VIOLATIONS, dtype=np.int64)
+    actual = np.zeros(MAX_VIOLATIONS, dtype=np.float64)
+    expected = np.zeros(MAX_VIOLATIONS, dtype=np.float64)
+    n = 0
+
+    # Expected hours are rounded to hundredths so float residue (8 + 1.3 hours
+    # leaving 1.3000000000000007 over the threshold) never flags exact pay as short
+
+    # Daily overtime check
+    if total_hours > DAILY_OVERTIME_THRESHOLD:
+        expected_daily_ot = round_cents(total_hours - DAILY_OVERTIME_THRESHOLD)
+        if overtime_hours < expected_daily_ot:
+            codes[n] = DAILY_OVERTIME
+            actual[n] = overtime_hours
+            expected[n] = expected_daily_ot
+            n += 1
+
+    # Weekly overtime check
+    if total_hours > WEEKLY_OVERTIME_THRESHOLD:
+        expected_weekly_ot = round_cents(total_hours - WEEKLY_OVERTIME_THRESHOLD)
+        if overtime_hours < expected_weekly_ot:
+            codes[n] = WEEKLY_OVERTIME
+            actual[n] = overtime_hours
+            expected[n] = expected_weekly_ot
+            n += 1
+
+    # Double time check
+    if total_hours > DAILY_DOUBLE_TIME_THRESHOLD:
+        expected_double_time = round_cents(total_hours - DAILY_DOUBLE_TIME_THRESHOLD)
+        if double_time_hours < expected_double_time:
+            codes[n] = DOUBLE_TIME
+            actual[n] = double_time_hours
+            expected[n] = expected_double_time
+            n += 1
+
+    # Overtime rate check
+    expected_overtime_rate = round_cents(hourly_rate * OVERTIME_MULTIPLIER)
+    if overtime_rate > 0 and overtime_rate < expected_overtime_rate:
+        codes[n] = OVERTIME_RATE
+        actual[n] = overtime_rate
+        expected[n] = expected_overtime_rate
+        n += 1
+
+    # Meal breaks: first for 5+ hour shifts, second for 10+ hour shifts
+    if total_hours >= SECOND_MEAL_BREAK_THRESHOLD:
+        codes[n] = SECOND_MEAL_BREAK
+        n += 1
+    elif total_hours >= MEAL_BREAK_THRESHOLD:
+        codes[n] = MEAL_BREAK
+        n += 1
+
+    # Rest breaks: for POC, we assume rest breaks weren't properly compensated
+    if total_hours >= REST_BREAK_INTERVAL:
+        required_breaks = math.floor(total_hours / REST_BREAK_INTERVAL)
+        codes[n] = REST_BREAK
+        expected[n] = round_cents((required_breaks * REST_BREAK_DURATION / 60.0) * hourly_rate)
+        n += 1
+
+    # Gross pay should match the calculated amount within tolerance
+    if regular_hours > 0 and hourly_rate > 0:
+        total_calculated = (regular_hours * hourly_rate
+                            + overtime_hours * overtime_rate
+                            + double_time_hours * double_time_rate)
+        if abs(gross_pay - total_calculated) > total_calculated * PAY_CALCULATION_TOLERANCE:
+            codes[n] = PAY_CALCULATION
+            actual[n] = gross_pay
+            expected[n] = round_cents(total_calculated)
+            n += 1
+
+    return codes, actual, expected, n
+
+
+@njit(_CHECK_BATCH_SIGNATURE, cache=True, parallel=True)
+def check_batch(values):
+    """
+    Run check_all for every pay stub in a batch
+
+    Each row of values holds one pay stub's check_all arguments. Rows are
+    independent, so they are split across threads without holding the GIL.
+
+    Returns:
+        (codes, actual, expected, counts): row i holds the check_all results for
+        pay stub i, of which the first counts[i] entries are violations
+    """
+    rows = values.shape[0]
+    codes = np.empty((rows, MAX_VIOLATIONS), dtype=np.int64)
+    actual = np.empty((rows, MAX_VIOLATIONS), dtype=np.float64)
+    expected = np.empty((rows, MAX_VIOLATIONS), dtype=np.float64)
+    counts = np.empty(rows, dtype=np.int64)
+
+    for i in prange(rows):
+        row_codes, row_actual, row_expected, n = check_all(
+            values[i, 0], values[i, 1], values[i, 2], values[i, 3],
+            values[i, 4], values[i, 5], values[i, 6], values[i, 7]
+        )
+        codes[i, :] = row_codes
+        actual[i, :] = row_actual
+        expected[i, :] = row_expected
+        counts[i] = n
+
+    return codes, actual, expected, counts